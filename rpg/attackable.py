@@ -1,5 +1,7 @@
-import random
 from abc import ABC, abstractmethod
+from random import choices as _choices
+
+DAMAGE_BATCH_SIZE = 64
 
 
 class Combat(ABC):
@@ -13,8 +15,13 @@ class Combat(ABC):
         _type_: _description_
     """
 
+    __slots__ = ()
+
     health: int
     damage: int
+    # Prefilled damage rolls and the damage stat they were rolled for.
+    _damage_rolls: list
+    _rolled_for: int
 
     @abstractmethod
     def get_name(self) -> str:
@@ -30,22 +37,41 @@ class Combat(ABC):
         Reduce health by the given damage
         and print a message.
         """
+        name = self.get_name()
         self.health -= damage
         print(
-            f"{self.get_name()} takes {damage} damage! "
-            f"{self.get_name()} has {self.health} health remaining."
+            f"{name} takes {damage} damage! "
+            f"{name} has {self.health} health remaining."
         )
 
     def is_alive(self) -> bool:
         """Return True if the entity is still alive (health > 0)."""
         return self.health > 0
 
+    def roll_damage_batch(self, n: int) -> list:
+        """
+        Roll n random damage values within the combatant's damage range.
+
+        Args:
+            n (int): The number of rolls to make.
+
+        Returns:
+            list: The rolled damage values.
+        """
+        damage = self.damage
+        return _choices(range(int(damage * 0.8), damage + 1), k=n)
+
     def attack(self, target: "Combat") -> None:
         """Attack the target and deal random damage."""
         if self.is_alive():
-            damage_dealt = random.randint(
-                int(self.damage * 0.8), self.damage
-            )  # Random damage within range
+            damage = self.damage
+            rolls = self._damage_rolls
+            if not rolls or self._rolled_for != damage:
+                rolls = self._damage_rolls = self.roll_damage_batch(
+                    DAMAGE_BATCH_SIZE
+                )
+                self._rolled_for = damage
+            damage_dealt = rolls.pop()  # Random damage within range
             print(
                 f"{self.get_name()} attacks {target.get_name()} for "
                 f"{damage_dealt} damage!"
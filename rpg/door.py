@@ -8,6 +8,8 @@ class Inspectable(ABC):
     Abstract base class for objects that can be inspected.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def inspect(self) -> str:
         """
@@ -21,6 +23,8 @@ class Interactable(ABC):
     Abstract base class for objects that can interact with the player.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def interact(self, player) -> None:
         """
@@ -42,6 +46,8 @@ class Door(Inspectable, Interactable, JsonSerializable):
         opposite_room: The room opposite to this door.
     """
 
+    __slots__ = ("description", "connected_room", "opposite_room")
+
     def __init__(
                 self,
                 description: str,
@@ -96,8 +102,8 @@ class Door(Inspectable, Interactable, JsonSerializable):
         """
         return {
             "description": self.description,
-            "connected_room_id": id(self.connected_room),
-            "opposite_room_id": id(self.opposite_room),
+            "connected_room_id": self.connected_room.room_id,
+            "opposite_room_id": self.opposite_room.room_id,
         }
 
     @classmethod
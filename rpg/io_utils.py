@@ -1,11 +1,34 @@
+import io
 import json
 import os
+import sys
+from contextlib import redirect_stdout
 
 from rpg.door import Door
-from rpg.jsonseri import JsonSerializable
+from rpg.jsonseri import JsonSerializable, dumps, loads
 from rpg.room import NPC, Enemy, Player, Room, Wizard
 
 
+def run_buffered(action, *args):
+    """
+    Run an action while collecting everything it prints, then write the
+    collected output to stdout in one go.
+
+    Args:
+        action: The callable to run.
+        *args: Positional arguments passed to the action.
+
+    Returns:
+        The return value of the action.
+    """
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            return action(*args)
+    finally:
+        sys.stdout.write(output.getvalue())
+
+
 class Scanner:
     """
     A utility class for reading integer input.
@@ -29,18 +52,24 @@ class Scanner:
 
         Returns:
             int: The integer input by the user or from simulated inputs.
+
+        Raises:
+            EOFError: If the input is closed and the simulated inputs are
+                used up.
         """
-        try:
-            return int(input(prompt))
-        except EOFError:
-            if Scanner.current_index < len(Scanner.simulated_inputs):
-                simulated_input = Scanner.simulated_inputs[
-                    Scanner.current_index
-                    ]
-                Scanner.current_index += 1
-                return simulated_input
-        except ValueError:
-            return Scanner.read_int(prompt)
+        while True:
+            try:
+                return int(input(prompt))
+            except EOFError:
+                if Scanner.current_index < len(Scanner.simulated_inputs):
+                    simulated_input = Scanner.simulated_inputs[
+                        Scanner.current_index
+                        ]
+                    Scanner.current_index += 1
+                    return simulated_input
+                raise
+            except ValueError:
+                continue
 
 
 class Saver:
@@ -71,8 +100,9 @@ class Saver:
         try:
             Saver.ensure_save_directory()
             save_path = os.path.join(Saver.save_dir, Saver.save_file)
-            with open(save_path, "w") as save_file:
-                json.dump(game.toJSON(), save_file, indent=4)
+            payload = dumps(game.toJSON())
+            with open(save_path, "wb") as save_file:
+                save_file.write(payload)
             print("Game successfully saved!")
         except Exception as e:
             print(f"An error occurred while saving the game: {e}")
@@ -89,8 +119,9 @@ class Saver:
             save_path = os.path.join(Saver.save_dir, Saver.save_file)
             if not os.path.exists(save_path):
                 raise FileNotFoundError("Save file not found.")
-            with open(save_path, "r") as load_file:
-                game_data = json.load(load_file)
+            with open(save_path, "rb") as load_file:
+                raw = load_file.read()
+            game_data = loads(raw)
             print("Game successfully loaded!")
             return game_data
         except FileNotFoundError as e:
@@ -102,6 +133,12 @@ class Saver:
         return None
 
 
+class IncompatibleSaveError(ValueError):
+    """
+    Raised when a save was written in a different save format.
+    """
+
+
 class Game(JsonSerializable):
     """
     A class representing the game state.
@@ -111,19 +148,38 @@ class Game(JsonSerializable):
         player (Player): The player object.
     """
 
+    save_version = 1
+
     def __init__(self):
         """
         Initialize the game state.
         """
-        self.rooms = {}
+        npc1 = NPC(description="A suspiciously happy looking orc")
+        npc2 = Enemy(description="A fierce goblin", health=50, damage=15)
+        npc3 = NPC(description="The kerstman")
+        npc4 = Enemy(
+            description="A dangerous vampire",
+            health=60,
+            damage=100,
+            is_boss=True,
+        )
+        wizard = Wizard(
+            description="A wise old wizard", bonus_damage=10, healing_power=30
+        )
 
         self.initial_room = Room(
-            description="A dusty room full of old computers."
-            )
-        self.second_room = Room(description="A dark room with dark doors.")
+            description="A dusty room full of old computers.",
+            npcs=[npc1, npc2],
+        )
+        self.second_room = Room(
+            description="A dark room with dark doors.",
+            npcs=[npc3, npc4, wizard],
+        )
 
-        self.rooms[self.initial_room.room_id] = self.initial_room
-        self.rooms[self.second_room.room_id] = self.second_room
+        self.rooms = {
+            room.room_id: room
+            for room in (self.initial_room, self.second_room)
+        }
 
         self.player = Player(
             name="Matthew",
@@ -143,47 +199,20 @@ class Game(JsonSerializable):
             opposite_room=self.initial_room,
         )
 
-        self.initial_room.add_door(door1)
-        self.initial_room.add_door(door2)
-        self.second_room.add_door(door1)
-        self.second_room.add_door(door2)
+        # Doors need both rooms to exist, so they are attached afterwards.
+        self.initial_room.doors.extend((door1, door2))
+        self.second_room.doors.extend((door1, door2))
 
-        npc1 = NPC(description="A suspiciously happy looking orc")
-        npc2 = Enemy(description="A fierce goblin", health=50, damage=15)
-        npc3 = NPC(description="The kerstman")
-        npc4 = Enemy(description="A dangerous vampire", health=60, damage=100)
-        wizard = Wizard(
-            description="A wise old wizard", bonus_damage=10, healing_power=30
-        )
-
-        self.initial_room.add_npc(npc1)
-        self.initial_room.add_npc(npc2)
-        self.second_room.add_npc(npc3)
-        self.second_room.add_npc(npc4)
-        self.second_room.add_npc(wizard)
+        self._vampire = npc4
 
     def main_loop(self) -> None:
         """
         The main game loop.
         """
-        vampire_defeated = False
-
-        while self.player.is_alive() and not vampire_defeated:
+        while self.player.is_alive() and self._vampire.is_alive():
             self.show_main_menu()
 
-            for room in self.rooms.values():
-                for npc in room.npcs:
-                    if (
-                        isinstance(npc, Enemy)
-                        and npc.description == "A dangerous vampire"
-                        and not npc.is_alive()
-                    ):
-                        vampire_defeated = True
-                        break
-                if vampire_defeated:
-                    break
-
-        if vampire_defeated:
+        if not self._vampire.is_alive():
             print("Congratulations! You won the game!")
         else:
             print("Game Over! You have died.")
@@ -195,7 +224,16 @@ class Game(JsonSerializable):
         Returns:
             dict: A dictionary representation of the game state.
         """
+        doors = {
+            id(door): door
+            for room in self.rooms.values()
+            for door in room.doors
+        }
         return {
+            "version": self.save_version,
+            "doors": {
+                door_id: door.toJSON() for door_id, door in doors.items()
+                },
             "rooms": {
                 room_id: room.toJSON() for room_id,
                 room in self.rooms.items()
@@ -213,21 +251,57 @@ class Game(JsonSerializable):
 
         Returns:
             Game: A deserialized Game object.
+
+        Raises:
+            IncompatibleSaveError: If the save has a different save_version.
         """
+        version = json_data.get("version")
+        if version != cls.save_version:
+            raise IncompatibleSaveError(
+                f"Save version {version} does not match {cls.save_version}."
+            )
         game = cls.__new__(cls)
-        game.rooms = {}
-        for room_data in json_data["rooms"].values():
+        rooms = game.rooms = {}
+        rooms_data = json_data["rooms"].values()
+        for room_data in rooms_data:
             room = Room.fromJSON(room_data)
-            game.rooms[room.room_id] = room
+            rooms[room.room_id] = room
 
-        for room in game.rooms.values():
-            for door in room.doors:
-                door.connected_room = game.rooms.get(door.connected_room_id)
-                door.opposite_room = game.rooms.get(door.opposite_room_id)
+        # Doors refer to rooms by ID, so they are rebuilt once every room
+        # exists and then shared between the rooms that list them.
+        doors = {
+            int(door_id): Door.fromJSON(door_data, rooms)
+            for door_id, door_data in json_data["doors"].items()
+        }
+        for room_data in rooms_data:
+            rooms[room_data["room_id"]].doors = [
+                doors[door_id] for door_id in room_data["door_ids"]
+            ]
 
-        game.player = Player.fromJSON(json_data["player"])
+        game.player = Player.fromJSON(json_data["player"], rooms)
+        game._vampire = cls._find_vampire(rooms)
         return game
 
+    @staticmethod
+    def _find_vampire(rooms):
+        """
+        Find the vampire that has to be defeated to win the game.
+
+        Args:
+            rooms (dict): A dictionary mapping room IDs to Room objects.
+
+        Returns:
+            Enemy: The boss enemy.
+
+        Raises:
+            ValueError: If none of the rooms holds the vampire.
+        """
+        for room in rooms.values():
+            for npc in room.npcs:
+                if isinstance(npc, Enemy) and npc.is_boss:
+                    return npc
+        raise ValueError("The saved game has no vampire to defeat.")
+
     def show_main_menu(self) -> None:
         """
         Display the main menu and handle user input.
@@ -241,24 +315,42 @@ class Game(JsonSerializable):
 
         choice = Scanner.read_int("Enter your choice: ")
 
-        if choice == 0:
-            print(f"\nYou see: {self.player.current_room.inspect()}")
-        elif choice == 1:
-            self.look_for_way_out()
-        elif choice == 2:
-            self.look_for_company()
-        elif choice == 3:
-            print("Saving game....")
-            Saver.quicksave(self)
-        elif choice == 4:
-            print("Loading game...")
-            loaded_data = Saver.quickload()
-            if loaded_data:
-                loaded_game = Game.fromJSON(loaded_data)
-                self.__dict__.update(loaded_game.__dict__)
-                print("Game successfully loaded. Resuming from saved state.")
-        else:
+        action = self._main_menu_actions.get(choice)
+        if action is None:
             print("Invalid choice. Please try again.")
+        else:
+            action(self)
+
+    def look_around(self) -> None:
+        """
+        Inspect the current room.
+        """
+        print(f"\nYou see: {self.player.current_room.inspect()}")
+
+    def quicksave(self) -> None:
+        """
+        Save the game state.
+        """
+        print("Saving game....")
+        Saver.quicksave(self)
+
+    def quickload(self) -> None:
+        """
+        Replace the game state with the last quicksave, if there is one.
+        """
+        print("Loading game...")
+        loaded_data = Saver.quickload()
+        if loaded_data:
+            try:
+                loaded_game = Game.fromJSON(loaded_data)
+            except IncompatibleSaveError:
+                print(
+                    "Error: The save file is incompatible with this version "
+                    "of the game. Continuing the current game."
+                )
+                return
+            self.__dict__.update(loaded_game.__dict__)
+            print("Game successfully loaded. Resuming from saved state.")
 
     def look_for_way_out(self) -> None:
         """
@@ -269,9 +361,10 @@ class Game(JsonSerializable):
             print("There are no doors in this room.")
             return
 
-        print("\nYou look around for doors. You see:")
-        for index, door in enumerate(doors):
-            print(f"  ({index}) {door.inspect()}")
+        lines = [
+            f"  ({index}) {door.inspect()}" for index, door in enumerate(doors)
+        ]
+        print("\nYou look around for doors. You see:\n" + "\n".join(lines))
 
         choice = Scanner.read_int(
             "\nWhich door do you take? (-1 : stay here): "
@@ -293,9 +386,13 @@ class Game(JsonSerializable):
             print("There is no one here.")
             return
 
-        print("\nYou look if there’s someone here. You see:")
-        for index, npc in enumerate(npcs):
-            print(f"  ({index}) {npc.inspect()}")
+        lines = [
+            f"  ({index}) {npc.inspect()}" for index, npc in enumerate(npcs)
+        ]
+        print(
+            "\nYou look if there’s someone here. You see:\n"
+            + "\n".join(lines)
+        )
 
         choice = Scanner.read_int("\nInteract with? (-1 : do nothing): ")
 
@@ -324,17 +421,50 @@ class Game(JsonSerializable):
             print("  (1) Run away")
             choice = Scanner.read_int("Enter your choice: ")
 
-            if choice == 0:
-                self.player.attack(enemy)
-                if enemy.is_alive():
-                    enemy.attack(self.player)
-                else:
-                    print(f"{enemy.description} has been defeated!")
-                    self.player.current_room.npcs.remove(
-                        enemy
-                    )  # Remove enemy from NPC list
-            elif choice == 1:
-                print("You ran away!")
-                break
-            else:
+            action = self._combat_actions.get(choice)
+            if action is None:
                 print("Invalid choice.")
+            elif not run_buffered(action, self, enemy):
+                break
+
+    def attack_enemy(self, enemy: Enemy) -> bool:
+        """
+        Attack the enemy and let it strike back if it survives.
+
+        Args:
+            enemy (Enemy): The enemy to attack.
+
+        Returns:
+            bool: True, since combat carries on until someone dies.
+        """
+        self.player.attack(enemy)
+        if enemy.is_alive():
+            enemy.attack(self.player)
+        else:
+            print(f"{enemy.description} has been defeated!")
+            self.player.current_room.remove_npc(enemy)
+        return True
+
+    def run_away(self, enemy: Enemy) -> bool:
+        """
+        Flee from the enemy.
+
+        Args:
+            enemy (Enemy): The enemy to flee from.
+
+        Returns:
+            bool: False, to end the combat.
+        """
+        print("You ran away!")
+        return False
+
+    # Menu choices mapped to the methods that handle them, built once
+    # for the class rather than per game.
+    _main_menu_actions = {
+        0: look_around,
+        1: look_for_way_out,
+        2: look_for_company,
+        3: quicksave,
+        4: quickload,
+    }
+    _combat_actions = {0: attack_enemy, 1: run_away}
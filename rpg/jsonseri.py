@@ -1,6 +1,37 @@
 import json
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Serialize an object to indented JSON bytes.
+
+    Uses orjson when it is installed and falls back to the standard
+    library json module otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def loads(data: bytes):
+    """
+    Deserialize JSON bytes into Python objects.
+
+    Uses orjson when it is installed and falls back to the standard
+    library json module otherwise.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class JsonSerializable(ABC):
     """
@@ -13,6 +44,8 @@ class JsonSerializable(ABC):
         _type_: _description_
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def toJSON(self):
         """
@@ -34,14 +67,15 @@ class JsonSerializable(ABC):
         """
         Saves the object to a JSON file.
         """
-        with open(filename, "w") as f:
-            json.dump(self.toJSON(), f, indent=4)
+        payload = dumps(self.toJSON())
+        with open(filename, "wb") as f:
+            f.write(payload)
 
     @classmethod
     def load(cls, filename):
         """
         Loads a JSON file and converts it back into an instance of the class.
         """
-        with open(filename, "r") as f:
-            data = json.load(f)
+        with open(filename, "rb") as f:
+            data = loads(f.read())
         return cls.fromJSON(data)
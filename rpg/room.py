@@ -1,11 +1,12 @@
-from pydantic import BaseModel, Field, PrivateAttr, field_validator
+from dataclasses import dataclass, field
 
 from rpg.attackable import Combat
 from rpg.door import Inspectable, Interactable
-from rpg.jsonseri import JsonSerializable
+from rpg.jsonseri import JsonSerializable, loads
 
 
-class NPC(BaseModel, JsonSerializable, Inspectable, Interactable):
+@dataclass(slots=True)
+class NPC(JsonSerializable, Inspectable, Interactable):
     """
     A class representing a non-player character (NPC).
 
@@ -13,7 +14,7 @@ class NPC(BaseModel, JsonSerializable, Inspectable, Interactable):
         description (str): The description of the NPC.
     """
 
-    description: str = Field(...)
+    description: str
 
     def toJSON(self):
         """
@@ -56,35 +57,36 @@ class NPC(BaseModel, JsonSerializable, Inspectable, Interactable):
         return cls(description=json_data["description"])
 
 
+@dataclass(slots=True)
 class Enemy(NPC, Combat):
     """
     A class representing an enemy NPC.
 
     Attributes:
-        _health (int): The health of the enemy.
-        _damage (int): The damage the enemy can inflict.
+        health (int): The health of the enemy.
+        damage (int): The damage the enemy can inflict.
+        is_boss (bool): Whether defeating this enemy wins the game.
     """
 
-    _health: int = PrivateAttr(...)
-    _damage: int = PrivateAttr(...)
+    health: int
+    damage: int
+    is_boss: bool = False
+    _damage_rolls: list = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _rolled_for: int = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-    @field_validator("health")
-    def validate_health(cls, value):
+    def __post_init__(self):
         """
         Validate the health value.
 
-        Args:
-            value (int): The health value to validate.
-
-        Returns:
-            int: The validated health value.
-
         Raises:
             ValueError: If the health value is less than or equal to 0.
         """
-        if value <= 0:
+        if self.health <= 0:
             raise ValueError("Health must be greater than 0.")
-        return value
 
     def toJSON(self):
         """
@@ -97,6 +99,7 @@ class Enemy(NPC, Combat):
             "description": self.description,
             "health": self.health,
             "damage": self.damage,
+            "is_boss": self.is_boss,
         }
 
     @classmethod
@@ -114,6 +117,7 @@ class Enemy(NPC, Combat):
             description=json_data["description"],
             health=json_data["health"],
             damage=json_data["damage"],
+            is_boss=json_data.get("is_boss", False),
         )
 
     def get_name(self) -> str:
@@ -126,6 +130,7 @@ class Enemy(NPC, Combat):
         return self.description
 
 
+@dataclass(slots=True)
 class Wizard(NPC):
     """
     A class representing a wizard NPC.
@@ -135,8 +140,8 @@ class Wizard(NPC):
         healing_power (int): The healing power of the wizard.
     """
 
-    bonus_damage: int = Field(...)
-    healing_power: int = Field(...)
+    bonus_damage: int
+    healing_power: int
 
     def toJSON(self):
         """
@@ -184,7 +189,25 @@ class Wizard(NPC):
         )
 
 
-class Room(BaseModel, JsonSerializable, Inspectable):
+def _npc_from_json(json_data):
+    """
+    Deserialize an NPC as the concrete class its JSON was produced by.
+
+    Args:
+        json_data (dict): A dictionary representation of an NPC.
+
+    Returns:
+        NPC: A deserialized NPC, Enemy or Wizard object.
+    """
+    if "health" in json_data:
+        return Enemy.fromJSON(json_data)
+    if "bonus_damage" in json_data:
+        return Wizard.fromJSON(json_data)
+    return NPC.fromJSON(json_data)
+
+
+@dataclass(slots=True)
+class Room(JsonSerializable, Inspectable):
     """
     A class representing a room in the game.
 
@@ -195,32 +218,32 @@ class Room(BaseModel, JsonSerializable, Inspectable):
         room_id (int): The unique identifier for the room.
     """
 
-    description: str = Field(...)
-    doors: list = []
-    npcs: list = []
+    description: str
+    doors: list = field(default_factory=list)
+    npcs: list = field(default_factory=list)
     room_id: int = None
 
-    def __init__(self, **data):
+    def __post_init__(self):
         """
-        Initialize a Room object.
-
-        Args:
-            **data: Arbitrary keyword arguments.
+        Assign the room a unique identifier unless one was given.
         """
-        super().__init__(**data)
-        self.room_id = id(self)
+        if self.room_id is None:
+            self.room_id = id(self)
 
     def toJSON(self):
         """
         Serialize the Room object to JSON.
 
+        Doors are shared between rooms, so only their ids are stored here and
+        Game.toJSON serializes each door once.
+
         Returns:
             dict: A dictionary representation of the Room object.
         """
         return {
             "description": self.description,
             "room_id": self.room_id,
-            "doors": [door.toJSON() for door in self.doors],
+            "door_ids": [id(door) for door in self.doors],
             "npcs": [npc.toJSON() for npc in self.npcs],
         }
 
@@ -242,22 +265,40 @@ class Room(BaseModel, JsonSerializable, Inspectable):
         """
         self.npcs.append(npc)
 
+    def remove_npc(self, npc):
+        """
+        Remove an NPC from the room.
+
+        The last NPC is moved into the freed slot, so the order of the
+        remaining NPCs is not preserved.
+
+        Args:
+            npc: The NPC object to remove.
+        """
+        npcs = self.npcs
+        index = next(i for i, other in enumerate(npcs) if other is npc)
+        npcs[index] = npcs[-1]
+        npcs.pop()
+
     @classmethod
     def fromJSON(cls, json_data):
         """
         Deserialize a Room object from JSON.
 
+        Doors are not restored here since they refer to other rooms, see
+        Game.fromJSON.
+
         Args:
             json_data (dict): A dictionary representation of the Room object.
 
         Returns:
             Room: A deserialized Room object.
         """
-        room = cls(description=json_data["description"])
-        room.room_id = json_data["room_id"]  # Set room ID for lookup
-        room.doors = []
-        room.npcs = [NPC.fromJSON(npc) for npc in json_data["npcs"]]
-        return room
+        return cls(
+            description=json_data["description"],
+            room_id=json_data["room_id"],  # Keep room ID for lookup
+            npcs=[_npc_from_json(npc) for npc in json_data["npcs"]],
+        )
 
     def inspect(self) -> str:
         """
@@ -274,7 +315,8 @@ class Room(BaseModel, JsonSerializable, Inspectable):
         )
 
 
-class Player(BaseModel, JsonSerializable, Combat):
+@dataclass(slots=True)
+class Player(JsonSerializable, Combat):
     """
     A class representing the player.
 
@@ -285,10 +327,16 @@ class Player(BaseModel, JsonSerializable, Combat):
         damage (int): The damage the player can inflict.
     """
 
-    name: str = Field(...)
+    name: str
     current_room: Room
-    health: int = Field(default=100)
-    damage: int = Field(default=20)
+    health: int = 100
+    damage: int = 20
+    _damage_rolls: list = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _rolled_for: int = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def toJSON(self):
         """
@@ -299,29 +347,48 @@ class Player(BaseModel, JsonSerializable, Combat):
         """
         return {
             "name": self.name,
-            "current_room": self.current_room.toJSON(),
+            "current_room_id": self.current_room.room_id,
             "health": self.health,
             "damage": self.damage,
         }
 
     @classmethod
-    def fromJSON(cls, json_data):
+    def fromJSON(cls, json_data, room_dict):
         """
-        Deserialize a Player object from JSON.
+        Deserialize a Player object by looking up the current room by its ID
+        in room_dict.
 
         Args:
             json_data (dict): A dictionary representation of the Player object.
+            room_dict (dict): A dictionary mapping room IDs to Room objects.
 
         Returns:
             Player: A deserialized Player object.
         """
         return cls(
             name=json_data["name"],
-            current_room=Room.fromJSON(json_data["current_room"]),
+            current_room=room_dict[json_data["current_room_id"]],
             health=json_data["health"],
             damage=json_data["damage"],
         )
 
+    @classmethod
+    def load(cls, filename, room_dict):
+        """
+        Load a Player from a JSON file, looking up its current room by its ID
+        in room_dict since the file only stores the room's ID.
+
+        Args:
+            filename (str): The file to load the Player from.
+            room_dict (dict): A dictionary mapping room IDs to Room objects.
+
+        Returns:
+            Player: The loaded Player object.
+        """
+        with open(filename, "rb") as f:
+            data = loads(f.read())
+        return cls.fromJSON(data, room_dict)
+
     def change_room(self, new_room: Room) -> None:
         """
         Change the player's current room.
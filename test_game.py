@@ -1,32 +1,116 @@
+"""
+Tests for the rpg package.
+
+PYTEST_DONT_REWRITE: the tests use unittest assertions or give their asserts
+a message, so pytest's assertion rewriting is skipped for this module.
+"""
+
+import copy
+import functools
+import math
+import os
+import random
+import tempfile
 import unittest
+from unittest import mock
 
+import pytest
+
+from rpg.io_utils import Game, IncompatibleSaveError, Saver, Scanner
+from rpg.jsonseri import dumps
 from rpg.room import Enemy, Player, Room, Wizard
 
 
+def _make_hero(room, health=100, damage=20):
+    """
+    Create the test player, Hero, in the given room.
+    """
+    return Player(
+        name="Hero", current_room=room, health=health, damage=damage
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _default_room(description):
+    """
+    Return a shared room, only for tests that never modify it.
+    """
+    return Room(description=description)
+
+
+# Prototypes shared by the tests that only read them, tests that modify an
+# enemy work on a copy.
+_GOBLIN_PROTOTYPE = Enemy(description="Goblin", health=50, damage=15)
+_OLD_WIZARD = Wizard(
+    description="Old Wizard", bonus_damage=10, healing_power=20
+)
+_PROTOTYPE_SNAPSHOTS = [
+    (prototype, copy.copy(prototype))
+    for prototype in (_GOBLIN_PROTOTYPE, _OLD_WIZARD)
+]
+
+
+@pytest.fixture(autouse=True)
+def _check_prototypes():
+    """
+    Fail any test that modifies one of the shared prototypes.
+    """
+    yield
+    for prototype, snapshot in _PROTOTYPE_SNAPSHOTS:
+        assert prototype == snapshot, f"Test modified {prototype!r}"
+
+
+@pytest.mark.parametrize(
+    "factory,expected",
+    [
+        (
+            lambda: _make_hero(_default_room("Test Room")),
+            {"name": "Hero", "health": 100, "damage": 20},
+        ),
+        (
+            lambda: Enemy(description="Goblin", health=50, damage=15),
+            {"description": "Goblin", "health": 50},
+        ),
+        (
+            lambda: Wizard(
+                description="Old Wizard", bonus_damage=10, healing_power=20
+            ),
+            {
+                "description": "Old Wizard",
+                "bonus_damage": 10,
+                "healing_power": 20,
+            },
+        ),
+    ],
+    ids=["player", "enemy", "wizard"],
+)
+def test_construction(factory, expected):
+    """
+    Test that players, enemies and wizards are created with the correct
+    attributes.
+    """
+    obj = factory()
+    actual = {attr: getattr(obj, attr) for attr in expected}
+    assert actual == expected, f"{actual} != {expected}"
+
+
 class TestPlayer(unittest.TestCase):
     """
     Unit tests for the Player class.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Set up a test player and room for each test.
+        Set up a test room shared by every test, the tests never modify it.
         """
-        self.room = Room(description="Test Room")
-        self.player = Player(
-                            name="Hero",
-                            current_room=self.room,
-                            health=100,
-                            damage=20
-                            )
+        cls.room = _default_room("Test Room")
 
-    def test_player_creation(self):
+    def setUp(self):
         """
-        Test that a player is created with the correct attributes.
+        Set up a fresh test player for each test.
         """
-        self.assertEqual(self.player.name, "Hero")
-        self.assertEqual(self.player.health, 100)
-        self.assertEqual(self.player.damage, 20)
+        self.player = _make_hero(self.room)
 
     def test_player_change_room(self):
         """
@@ -43,6 +127,17 @@ class TestPlayer(unittest.TestCase):
         self.player.take_damage(10)
         self.assertEqual(self.player.health, 90)
 
+    def test_player_save_and_load(self):
+        """
+        Test that a saved player is loaded back into its room.
+        """
+        with tempfile.TemporaryDirectory() as save_dir:
+            filename = os.path.join(save_dir, "player.json")
+            self.player.save(filename)
+            player = Player.load(filename, {self.room.room_id: self.room})
+        self.assertEqual(player, self.player)
+        self.assertIs(player.current_room, self.room)
+
 
 class TestEnemy(unittest.TestCase):
     """
@@ -51,16 +146,9 @@ class TestEnemy(unittest.TestCase):
 
     def setUp(self):
         """
-        Set up a test enemy for each test.
+        Copy the prototype enemy for each test, since tests damage it.
         """
-        self.enemy = Enemy(description="Goblin", health=50, damage=15)
-
-    def test_enemy_creation(self):
-        """
-        Test that an enemy is created with the correct attributes.
-        """
-        self.assertEqual(self.enemy.description, "Goblin")
-        self.assertEqual(self.enemy.health, 50)
+        self.enemy = copy.copy(_GOBLIN_PROTOTYPE)
 
     def test_enemy_take_damage(self):
         """
@@ -77,39 +165,43 @@ class TestEnemy(unittest.TestCase):
         self.enemy.take_damage(50)
         self.assertFalse(self.enemy.is_alive())
 
-
-class TestWizard(unittest.TestCase):
-    """
-    Unit tests for the Wizard class.
-    """
-
-    def setUp(self):
+    def test_enemy_roll_damage_batch(self):
         """
-        Set up a test wizard and room for each test.
+        Test that batched damage rolls stay within the damage range.
         """
-        self.wizard = Wizard(
-            description="Old Wizard", bonus_damage=10, healing_power=20
-        )
-        self.room = Room(description="Wizard Room")
+        rolls = _GOBLIN_PROTOTYPE.roll_damage_batch(100)
+        self.assertEqual(len(rolls), 100)
+        self.assertTrue(all(12 <= roll <= 15 for roll in rolls))
 
-    def test_wizard_creation(self):
+    def test_enemy_attack_rolls(self):
         """
-        Test that a wizard is created with the correct attributes.
+        Test that seeded attacks repeat and follow a damage change.
         """
-        self.assertEqual(self.wizard.description, "Old Wizard")
-        self.assertEqual(self.wizard.bonus_damage, 10)
-        self.assertEqual(self.wizard.healing_power, 20)
+        healths = []
+        for _ in range(2):
+            random.seed(1)
+            hero = _make_hero(_default_room("Test Room"), health=1000)
+            self.enemy = copy.copy(_GOBLIN_PROTOTYPE)
+            for _ in range(3):
+                self.enemy.attack(hero)
+            healths.append(hero.health)
+        self.assertEqual(healths[0], healths[1])
+        self.enemy.damage = 100
+        self.enemy.attack(hero)
+        self.assertGreaterEqual(healths[1] - hero.health, 80)
+
+
+class TestWizard(unittest.TestCase):
+    """
+    Unit tests for the Wizard class.
+    """
 
     def test_wizard_give_bonus(self):
         """
         Test that a wizard can give a bonus to a player.
         """
-        player = Player(name="Hero",
-                        current_room=self.room,
-                        health=100,
-                        damage=20
-                        )
-        self.wizard.give_bonus(player)
+        player = _make_hero(_default_room("Wizard Room"))
+        _OLD_WIZARD.give_bonus(player)
         self.assertEqual(player.health, 120)
         self.assertEqual(player.damage, 30)
 
@@ -119,51 +211,61 @@ class TestGameIntegration(unittest.TestCase):
     Integration tests for the game components.
     """
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         """
-        Set up test rooms, player, enemy, and wizard for each test.
+        Set up prototypes shared by every test. Rooms and the wizard are
+        never modified, the enemy is copied by the tests that damage it.
         """
-        self.room1 = Room(description="Room 1")
-        self.room2 = Room(description="Room 2")
-        self.player = Player(
-            name="Hero", current_room=self.room1, health=100, damage=20
-        )
-        self.enemy = Enemy(description="Goblin", health=50, damage=10)
-        self.wizard = Wizard(
+        cls.room1 = _default_room("Room 1")
+        cls.room2 = _default_room("Room 2")
+        cls.enemy_prototype = Enemy(description="Goblin", health=50, damage=10)
+        cls.wizard = Wizard(
             description="Old Wizard", bonus_damage=10, healing_power=30
         )
 
-        self.room1.add_npc(self.enemy)
-        self.room2.add_npc(self.wizard)
-
     def test_player_move_between_rooms(self):
         """
         Test that a player can move between rooms.
         """
-        self.player.change_room(self.room2)
-        self.assertEqual(self.player.current_room.description, "Room 2")
+        player = _make_hero(self.room1)
+        player.change_room(self.room2)
+        self.assertEqual(player.current_room.description, "Room 2")
 
     def test_combat_with_enemy(self):
         """
         Test that a player can engage in combat with an enemy.
         """
-        self.player.attack(self.enemy)
-        self.assertLess(self.enemy.health, 50)
+        player = _make_hero(self.room1)
+        enemy = copy.copy(self.enemy_prototype)
+        player.attack(enemy)
+        self.assertLess(enemy.health, 50)
 
     def test_interact_with_wizard(self):
         """
         Test that a player can interact with a wizard.
         """
-        self.wizard.give_bonus(self.player)
-        self.assertEqual(self.player.health, 130)
-        self.assertEqual(self.player.damage, 30)
+        player = _make_hero(self.room2)
+        self.wizard.give_bonus(player)
+        self.assertEqual(player.health, 130)
+        self.assertEqual(player.damage, 30)
+
+    def test_remove_npc_from_room(self):
+        """
+        Test that removing an NPC leaves the other NPCs in the room.
+        """
+        enemy = copy.copy(self.enemy_prototype)
+        room = Room(description="Room 1", npcs=[enemy, self.wizard])
+        room.remove_npc(enemy)
+        self.assertEqual(room.npcs, [self.wizard])
 
     def test_combat_with_death(self):
         """
         Test that an enemy can be killed in combat.
         """
-        self.enemy.take_damage(50)
-        self.assertFalse(self.enemy.is_alive())
+        enemy = copy.copy(self.enemy_prototype)
+        enemy.take_damage(50)
+        self.assertFalse(enemy.is_alive())
 
 
 class TestGameFunctional(unittest.TestCase):
@@ -177,7 +279,7 @@ class TestGameFunctional(unittest.TestCase):
         """
         room1 = Room(description="Start Room")
         room2 = Room(description="End Room")
-        player = Player(name="Hero", current_room=room1, health=100, damage=20)
+        player = _make_hero(room1)
         enemy = Enemy(description="Dragon", health=100, damage=25)
         wizard = Wizard(description="Helpful Wizard",
                         bonus_damage=10,
@@ -195,10 +297,84 @@ class TestGameFunctional(unittest.TestCase):
         self.assertEqual(player.damage, 30)
 
         player.change_room(room1)
-        while enemy.is_alive() and player.is_alive():
+        # Attacks roll at least 80% of the damage stat, so this many hits
+        # always kill the enemy, and it strikes back at most one time less.
+        hits_needed = math.ceil(enemy.health / int(player.damage * 0.8))
+        for _ in range(hits_needed - 1):
             player.attack(enemy)
-            if enemy.is_alive():
-                enemy.attack(player)
+            enemy.attack(player)
+        player.attack(enemy)
 
         self.assertTrue(player.is_alive())
         self.assertFalse(enemy.is_alive())
+
+    def test_game_json_round_trip(self):
+        """
+        Test that a saved game is restored with its doors linking rooms.
+        """
+        game = Game.fromJSON(Game().toJSON())
+        room = game.player.current_room
+        self.assertIs(room, game.rooms[room.room_id])
+        self.assertEqual(len(room.doors), 2)
+        for door in room.doors:
+            connected, opposite = door.connected_room, door.opposite_room
+            self.assertIs(connected, game.rooms[connected.room_id])
+            self.assertIs(opposite, game.rooms[opposite.room_id])
+        first_room, second_room = game.rooms.values()
+        self.assertEqual(
+            [id(door) for door in first_room.doors],
+            [id(door) for door in second_room.doors],
+        )
+        self.assertTrue(game._vampire.is_alive())
+
+    def test_quickload_incompatible_save(self):
+        """
+        Test that loading a save in another format keeps the current game.
+        """
+        room_data = {
+            "description": "Old Room",
+            "room_id": 1,
+            "doors": [],
+            "npcs": [],
+        }
+        old_save = {
+            "rooms": {1: room_data},
+            "player": {
+                "name": "Hero",
+                "current_room": room_data,
+                "health": 100,
+                "damage": 20,
+            },
+        }
+        game = Game()
+        newer_save = game.toJSON()
+        newer_save["version"] = Game.save_version + 1
+        player = game.player
+        for save in (old_save, newer_save):
+            with self.subTest(version=save.get("version")):
+                with self.assertRaises(IncompatibleSaveError):
+                    Game.fromJSON(save)
+                with tempfile.TemporaryDirectory() as save_dir:
+                    save_path = os.path.join(save_dir, Saver.save_file)
+                    with open(save_path, "wb") as f:
+                        f.write(dumps(save))
+                    with mock.patch.object(Saver, "save_dir", save_dir):
+                        game.quickload()
+                self.assertIs(game.player, player)
+
+
+class TestScanner(unittest.TestCase):
+    """
+    Unit tests for the Scanner class.
+    """
+
+    def test_read_int_simulated_inputs(self):
+        """
+        Test that closed input uses the simulated inputs, then raises.
+        """
+        with mock.patch.object(Scanner, "simulated_inputs", [3]):
+            with mock.patch.object(Scanner, "current_index", 0):
+                with mock.patch("builtins.input", side_effect=EOFError):
+                    self.assertEqual(Scanner.read_int("> "), 3)
+                    with self.assertRaises(EOFError):
+                        Scanner.read_int("> ")